@@ -12,13 +12,19 @@ Requires: pypdf (pip install pypdf)
 from __future__ import annotations
 
 import argparse
+import contextlib
+import io
+import itertools
+import mmap
 import os
+import stat
 import sys
-from typing import List, Optional, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
 
 try:
     from pypdf import PdfReader, PdfWriter
-    from pypdf._page import PageObject  # type: ignore
 except Exception as e:  # pragma: no cover - import-time guidance
     print(
         "Error: Missing dependency 'pypdf'.\n"
@@ -28,6 +34,13 @@ except Exception as e:  # pragma: no cover - import-time guidance
     raise
 
 
+# Output buffer size; pypdf issues many small writes per serialized object.
+WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Inputs at least this large are memory-mapped instead of read into memory
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+
 def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description=(
@@ -37,6 +50,7 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     )
     parser.add_argument(
         "input",
+        nargs="?",
         help="Input PDF file (single-sided scan: first half one side, second half other)",
     )
     parser.add_argument(
@@ -79,6 +93,21 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
         action="store_true",
         help="Do not write output; print the page mapping instead.",
     )
+    parser.add_argument(
+        "--batch",
+        metavar="DIR",
+        help=(
+            "Process every PDF in DIR (instead of a single input) and write "
+            "<name>.interleaved.pdf next to each."
+        ),
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes for --batch (default: CPU count).",
+    )
     return parser.parse_args(argv)
 
 
@@ -89,173 +118,308 @@ def determine_output_path(input_path: str, output_arg: Optional[str]) -> str:
     return f"{base}.interleaved.pdf"
 
 
-def split_halves(reader: PdfReader, split_at: Optional[int]) -> Tuple[List[PageObject], List[PageObject]]:
-    total = len(reader.pages)
+def find_batch_inputs(directory: str) -> List[str]:
+    """List the PDFs in ``directory``, skipping outputs of earlier runs."""
+    paths = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = entry.name.lower()
+            if (
+                entry.is_file()
+                and name.endswith(".pdf")
+                and not name.endswith(".interleaved.pdf")
+            ):
+                paths.append(entry.path)
+    return sorted(paths)
+
+
+def open_reader(
+    stack: contextlib.ExitStack,
+    input_path: str,
+    size: Optional[int] = None,
+    use_mmap: bool = True,
+) -> PdfReader:
+    """
+    Open the input PDF. Small files are read in one go; large ones are
+    memory-mapped when possible. The file (and mapping) stay open until
+    ``stack`` is closed, as pages are read lazily on write. Pass ``size`` when
+    the caller already has a stat result for the input.
+    """
+    if size is None:
+        size = os.path.getsize(input_path)
+    if not use_mmap or size < MMAP_THRESHOLD:
+        return PdfReader(io.BytesIO(Path(input_path).read_bytes()))
+
+    f = stack.enter_context(open(input_path, "rb"))
+    try:
+        mm = stack.enter_context(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    except (ValueError, OSError):
+        # Empty files or file systems without mmap support
+        return PdfReader(f)
+    return PdfReader(mm)
+
+
+def count_pages(reader: PdfReader) -> int:
+    """
+    Page count from the root /Pages /Count entry, which avoids flattening the
+    page tree. Falls back to len(reader.pages) if the entry is missing or invalid.
+    """
+    try:
+        count = reader.trailer["/Root"]["/Pages"]["/Count"]
+    except Exception:
+        # Missing keys or unresolvable references in damaged files
+        count = None
+    if isinstance(count, int) and count >= 0:
+        return int(count)
+    return len(reader.pages)
+
+
+def split_index(total: int, split_at: Optional[int]) -> int:
     if total == 0:
         raise ValueError("Input PDF has no pages")
 
     if split_at is None:
-        split_idx = total // 2
-    else:
-        if split_at < 1:
-            raise ValueError("--split must be >= 1 (1-based index)")
-        # convert 1-based to 0-based index for slicing; cap to total
-        split_idx = max(0, min(total, split_at - 1))
+        return total // 2
+    if split_at < 1:
+        raise ValueError("--split must be >= 1 (1-based index)")
+    # convert 1-based to 0-based index for slicing; cap to total
+    return max(0, min(total, split_at - 1))
 
-    first = [reader.pages[i] for i in range(0, split_idx)]
-    second = [reader.pages[i] for i in range(split_idx, total)]
-    return first, second
+
+def split_halves(reader: PdfReader, split_at: Optional[int]) -> Tuple[range, range]:
+    total = len(reader.pages)
+    split_idx = split_index(total, split_at)
+    # Index ranges only; no per-page lists are built here
+    return range(0, split_idx), range(split_idx, total)
 
 
 def interleave_pages(
-    first: List[PageObject],
-    second: List[PageObject],
+    first: Sequence[int],
+    second: Sequence[int],
     reverse_second: bool,
     pad_blank: bool,
-) -> List[Union[PageObject, None]]:
-    # Optionally reverse second half (typical scenario)
-    if reverse_second:
-        second = list(reversed(second))
-
-    # Optionally pad the shorter half with blanks (represented as None)
-    if pad_blank and len(first) != len(second):
-        diff = abs(len(first) - len(second))
-        if len(first) < len(second):
-            first = first + [None] * diff  # type: ignore
-        else:
-            second = second + [None] * diff  # type: ignore
-
-    interleaved: List[Union[PageObject, None]] = []
-    max_len = max(len(first), len(second))
-    for i in range(max_len):
-        if i < len(first):
-            interleaved.append(first[i])
-        if i < len(second):
-            interleaved.append(second[i])
-    return interleaved
+) -> Iterator[Optional[int]]:
+    """
+    Yield the output sequence as original page indices; None indicates a blank.
+    Reversal and padding are applied on the fly without intermediate lists.
+    """
+    first_len = len(first)
+    second_len = len(second)
+    if first_len == second_len:
+        # Balanced halves (the common case) need neither padding nor bounds
+        # checks; let zip/chain do the pairing in C.
+        if reverse_second:
+            second = reversed(second)  # type: ignore
+        yield from itertools.chain.from_iterable(zip(first, second))
+        return
+
+    for i in range(max(first_len, second_len)):
+        if i < first_len:
+            yield first[i]
+        elif pad_blank:
+            yield None
+        if i < second_len:
+            yield second[second_len - 1 - i] if reverse_second else second[i]
+        elif pad_blank:
+            yield None
 
 
 def write_output(
     reader: PdfReader,
-    interleaved: List[Union[PageObject, None]],
+    interleaved: Iterable[Optional[int]],
     output_path: str,
+    buffer_size: int = WRITE_BUFFER_SIZE,
 ) -> None:
     writer = PdfWriter()
 
-    # Determine base page size for blanks (from the first page)
-    base_width = None
-    base_height = None
-    if len(reader.pages) > 0:
-        media_box = reader.pages[0].mediabox
-        base_width = float(media_box.width)
-        base_height = float(media_box.height)
-
-    for idx, page in enumerate(interleaved):
-        if page is None:
-            if base_width is None or base_height is None:
-                raise ValueError("Cannot add blank page: unknown page size")
-            writer.add_blank_page(width=base_width, height=base_height)
+    # Base page size for blanks (from the first page), looked up only once a
+    # blank is actually needed
+    blank_size: Optional[Tuple[float, float]] = None
+
+    # Pages are resolved one at a time as the index stream is consumed;
+    # add_page de-duplicates shared resources across pages of the same reader.
+    for page_index in interleaved:
+        if page_index is None:
+            if blank_size is None:
+                if len(reader.pages) == 0:
+                    raise ValueError("Cannot add blank page: unknown page size")
+                media_box = reader.pages[0].mediabox
+                blank_size = (float(media_box.width), float(media_box.height))
+            writer.add_blank_page(width=blank_size[0], height=blank_size[1])
         else:
-            writer.add_page(page)
+            writer.add_page(reader.pages[page_index])
 
-    with open(output_path, "wb") as f:
+    with open(output_path, "wb", buffering=0) as raw, io.BufferedWriter(
+        raw, buffer_size=buffer_size
+    ) as f:
         writer.write(f)
 
 
-def plan_mapping(
-    first_len: int,
-    second_len: int,
-    reverse_second: bool,
-    pad_blank: bool,
-) -> List[Tuple[Optional[int], Optional[int]]]:
+def process_file(
+    input_path: str,
+    args: argparse.Namespace,
+    out: Optional[TextIO] = None,
+    err: Optional[TextIO] = None,
+) -> int:
     """
-    Build a plan of (first_half_index, second_half_index) pairs per output step.
-    Indices are 0-based within their respective halves; None indicates a blank.
+    Run the interleaver on one input; returns the process exit code.
+    Messages go to ``out``/``err`` (default: stdout/stderr).
     """
-    # Create index lists (with None for padded blanks)
-    first_idx = list(range(first_len))
-    second_idx = list(range(second_len))
-    if reverse_second:
-        second_idx = list(reversed(second_idx))
-
-    if pad_blank and len(first_idx) != len(second_idx):
-        diff = abs(len(first_idx) - len(second_idx))
-        if len(first_idx) < len(second_idx):
-            first_idx += [None] * diff  # type: ignore
-        else:
-            second_idx += [None] * diff  # type: ignore
+    if out is None:
+        out = sys.stdout
+    if err is None:
+        err = sys.stderr
+
+    # One stat serves the existence check, the size and the same-file check
+    try:
+        st = os.stat(input_path)
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        print(f"Error: Input file not found: {input_path}", file=err)
+        return 2
+    if st.st_size == 0:
+        print("Error reading PDF: Input file is empty", file=err)
+        return 1
+
+    # Default to reversing the second half (common case); main() rejects
+    # combining --reverse-second with --no-reverse-second.
+    reverse_second = not args.no_reverse_second
+
+    if args.dry_run:
+        # Only the page count is needed; the page tree is not walked
+        try:
+            with open(input_path, "rb") as f:
+                total = count_pages(PdfReader(f))
+        except Exception as e:
+            print(f"Error reading PDF: {e}", file=err)
+            return 1
+
+        try:
+            split_idx = split_index(total, args.split)
+        except Exception as e:
+            print(f"Error preparing halves: {e}", file=err)
+            return 2
+
+        first_len = split_idx
+        second_len = total - split_idx
+        print(
+            f"Input pages: {total} | first_half: {first_len} | second_half: {second_len}",
+            file=out,
+        )
+        print(
+            "Order (pairs show [first_half_index, second_half_index] in output sequence):",
+            file=out,
+        )
+        # Walk the same lazy index stream the writer consumes; blanks are not
+        # listed, so padding is left out.
+        order = interleave_pages(
+            range(0, split_idx), range(split_idx, total), reverse_second, False
+        )
+        # Collect all lines and emit them with a single write
+        lines: List[str] = []
+        for out_index, page_index in enumerate(order):
+            if page_index < split_idx:
+                lines.append(f"{out_index:4d}: first[{page_index}] -> output\n")
+            else:
+                lines.append(
+                    f"{out_index:4d}: second[{page_index - split_idx}] -> output\n"
+                )
+        out.write("".join(lines))
+        return 0
+
+    output_path = determine_output_path(input_path, args.output)
+    # Never map a file that is about to be truncated: on POSIX this faults on
+    # access, on Windows the mapped file cannot be replaced.
+    try:
+        use_mmap = not os.path.samestat(st, os.stat(output_path))
+    except OSError:
+        use_mmap = True
+
+    with contextlib.ExitStack() as stack:
+        try:
+            reader = open_reader(
+                stack, input_path, size=st.st_size, use_mmap=use_mmap
+            )
+        except Exception as e:
+            print(f"Error reading PDF: {e}", file=err)
+            return 1
+
+        try:
+            first, second = split_halves(reader, args.split)
+        except Exception as e:
+            print(f"Error preparing halves: {e}", file=err)
+            return 2
+
+        interleaved = interleave_pages(first, second, reverse_second, args.pad_blank)
+
+        try:
+            write_output(reader, interleaved, output_path)
+        except Exception as e:
+            print(f"Error writing output: {e}", file=err)
+            return 1
+
+    print(f"Wrote interleaved PDF: {output_path}", file=out)
+    return 0
 
-    mapping: List[Tuple[Optional[int], Optional[int]]] = []
-    max_len = max(len(first_idx), len(second_idx))
-    for i in range(max_len):
-        a = first_idx[i] if i < len(first_idx) else None
-        b = second_idx[i] if i < len(second_idx) else None
-        mapping.append((a, b))
-    return mapping
+
+def _process_batch_item(
+    input_path: str, args: argparse.Namespace
+) -> Tuple[int, str, str]:
+    """Run process_file in a worker, returning its output for the parent to print."""
+    out = io.StringIO()
+    err = io.StringIO()
+    rc = process_file(input_path, args, out=out, err=err)
+    return rc, out.getvalue(), err.getvalue()
 
 
 def main(argv: Optional[List[str]] = None) -> int:
     args = parse_args(argv)
 
-    input_path = args.input
-    if not os.path.isfile(input_path):
-        print(f"Error: Input file not found: {input_path}", file=sys.stderr)
-        return 2
-
-    # Decide reverse preference: default to reversing the second half (common case)
     if args.reverse_second and args.no_reverse_second:
         print(
             "Error: Use only one of --reverse-second or --no-reverse-second",
             file=sys.stderr,
         )
         return 2
-    reverse_second = True
-    if args.reverse_second:
-        reverse_second = True
-    if args.no_reverse_second:
-        reverse_second = False
 
-    try:
-        reader = PdfReader(input_path)
-    except Exception as e:
-        print(f"Error reading PDF: {e}", file=sys.stderr)
-        return 1
+    if args.batch is None:
+        if args.input is None:
+            print("Error: Provide an input PDF or --batch DIR", file=sys.stderr)
+            return 2
+        return process_file(args.input, args)
 
-    try:
-        first, second = split_halves(reader, args.split)
-    except Exception as e:
-        print(f"Error preparing halves: {e}", file=sys.stderr)
-        return 2
-
-    if args.dry_run:
-        mapping = plan_mapping(len(first), len(second), reverse_second, args.pad_blank)
+    if args.input is not None or args.output:
         print(
-            f"Input pages: {len(reader.pages)} | first_half: {len(first)} | second_half: {len(second)}"
-        )
-        print(
-            "Order (pairs show [first_half_index, second_half_index] in output sequence):"
+            "Error: --batch cannot be combined with an input file or --output",
+            file=sys.stderr,
         )
-        out_index = 0
-        for a, b in mapping:
-            if a is not None:
-                print(f"{out_index:4d}: first[{a}] -> output")
-                out_index += 1
-            if b is not None:
-                print(f"{out_index:4d}: second[{b}] -> output")
-                out_index += 1
-        return 0
-
-    interleaved = interleave_pages(first, second, reverse_second, args.pad_blank)
-    output_path = determine_output_path(input_path, args.output)
+        return 2
+    if args.jobs is not None and args.jobs < 1:
+        print("Error: --jobs must be >= 1", file=sys.stderr)
+        return 2
 
     try:
-        write_output(reader, interleaved, output_path)
-    except Exception as e:
-        print(f"Error writing output: {e}", file=sys.stderr)
-        return 1
+        inputs = find_batch_inputs(args.batch)
+    except OSError as e:
+        print(f"Error reading batch directory: {e}", file=sys.stderr)
+        return 2
+    if not inputs:
+        print(f"Error: No PDF files found in: {args.batch}", file=sys.stderr)
+        return 2
 
-    print(f"Wrote interleaved PDF: {output_path}")
-    return 0
+    # Each PDF is independent; fan them out, then print each file's messages
+    # as one block in input order and report the worst exit code
+    worst = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        results = executor.map(_process_batch_item, inputs, itertools.repeat(args))
+        for input_path, (rc, out, err) in zip(inputs, results):
+            if out:
+                sys.stdout.write(f"==> {input_path} <==\n{out}")
+            if err:
+                sys.stderr.write(f"==> {input_path} <==\n{err}")
+            worst = max(worst, rc)
+    return worst
 
 
 if __name__ == "__main__":
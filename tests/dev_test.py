@@ -6,6 +6,8 @@ page sizes, runs the interleaver in different modes, and asserts ordering.
 
 from __future__ import annotations
 
+import contextlib
+import io
 import os
 import sys
 from typing import List
@@ -89,6 +91,99 @@ def run_tests(tmpdir: str) -> None:
     prefix = got[:4]
     assert_eq(prefix, [1, 103, 2, 104], "Test 4 prefix")
 
+    # Test 4b: dry-run lists the planned order; blanks from padding are not listed
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        rc = tool.main([t3_in, "--split", "5", "--pad-blank", "--dry-run"])
+    if rc != 0:
+        raise SystemExit(f"Tool returned {rc} for test 4b")
+    assert_eq(
+        buf.getvalue().splitlines(),
+        [
+            "Input pages: 6 | first_half: 4 | second_half: 2",
+            "Order (pairs show [first_half_index, second_half_index] in output sequence):",
+            "   0: first[0] -> output",
+            "   1: second[1] -> output",
+            "   2: first[1] -> output",
+            "   3: second[0] -> output",
+            "   4: first[2] -> output",
+            "   5: first[3] -> output",
+        ],
+        "Test 4b",
+    )
+
+    # Test 5: batch mode processes every PDF in a directory, skipping earlier outputs
+    t5_dir = os.path.join(tmpdir, "t5_batch")
+    os.makedirs(t5_dir, exist_ok=True)
+    make_pdf(os.path.join(t5_dir, "a.pdf"), [1, 2, 102, 101])
+    make_pdf(os.path.join(t5_dir, "b.pdf"), [1, 2, 3, 103, 102, 101])
+    t5_a = os.path.join(t5_dir, "a.pdf")
+    t5_b = os.path.join(t5_dir, "b.pdf")
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        rc = tool.main(["--batch", t5_dir, "-j", "2"])
+    if rc != 0:
+        raise SystemExit(f"Tool returned {rc} for test 5")
+    # Each file's messages form one block headed by its path, in input order
+    assert_eq(
+        buf.getvalue().splitlines(),
+        [
+            f"==> {t5_a} <==",
+            f"Wrote interleaved PDF: {os.path.join(t5_dir, 'a.interleaved.pdf')}",
+            f"==> {t5_b} <==",
+            f"Wrote interleaved PDF: {os.path.join(t5_dir, 'b.interleaved.pdf')}",
+        ],
+        "Test 5 output",
+    )
+    assert_eq(read_ids(os.path.join(t5_dir, "a.interleaved.pdf")), [1, 101, 2, 102], "Test 5a")
+    assert_eq(
+        read_ids(os.path.join(t5_dir, "b.interleaved.pdf")),
+        [1, 101, 2, 102, 3, 103],
+        "Test 5b",
+    )
+    rc = tool.main(["--batch", t5_dir, "-j", "2"])
+    if rc != 0:
+        raise SystemExit(f"Tool returned {rc} for test 5 rerun")
+    assert_eq(sorted(os.listdir(t5_dir)), ["a.interleaved.pdf", "a.pdf", "b.interleaved.pdf", "b.pdf"], "Test 5 rerun")
+
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        rc = tool.main(["--batch", t5_dir, "-j", "2", "--dry-run"])
+    if rc != 0:
+        raise SystemExit(f"Tool returned {rc} for test 5 dry-run")
+    got_lines = buf.getvalue().splitlines()
+    assert_eq(
+        [got_lines[0], got_lines[1], got_lines[7], got_lines[8]],
+        [
+            f"==> {t5_a} <==",
+            "Input pages: 4 | first_half: 2 | second_half: 2",
+            f"==> {t5_b} <==",
+            "Input pages: 6 | first_half: 3 | second_half: 3",
+        ],
+        "Test 5 dry-run headers",
+    )
+    assert_eq(len(got_lines), 16, "Test 5 dry-run line count")
+
+    # Test 6: force the mmap input path (normally only for inputs >= 64 MiB),
+    # both for a separate output and for overwriting the input in place
+    saved_threshold = tool.MMAP_THRESHOLD
+    tool.MMAP_THRESHOLD = 0
+    try:
+        t6_out = os.path.join(tmpdir, "t6_out.pdf")
+        rc = tool.main([t1_in, "-o", t6_out])
+        if rc != 0:
+            raise SystemExit(f"Tool returned {rc} for test 6")
+        assert_eq(read_ids(t6_out), [1, 101, 2, 102, 3, 103], "Test 6")
+
+        t6_inplace = os.path.join(tmpdir, "t6_inplace.pdf")
+        make_pdf(t6_inplace, [1, 2, 3, 103, 102, 101])
+        rc = tool.main([t6_inplace, "-o", t6_inplace])
+        if rc != 0:
+            raise SystemExit(f"Tool returned {rc} for test 6 in place")
+        assert_eq(read_ids(t6_inplace), [1, 101, 2, 102, 3, 103], "Test 6 in place")
+    finally:
+        tool.MMAP_THRESHOLD = saved_threshold
+
     print("All tests passed.")
 
 